@@ -3,19 +3,43 @@
 
 from __future__ import annotations
 
-import json
-import subprocess
+import operator
+import os
+import re
 import sys
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 INVALID_SESSION_CHARS = {".", ":", " ", "\n", "\t", "'", "\\"}
+INVALID_SESSION_CHARS_RE = re.compile(f"[{re.escape(''.join(sorted(INVALID_SESSION_CHARS)))}]")
 MAX_SESSION_NAME_LENGTH = 100
-TMUX_FORMAT = "#{session_name}|#{session_windows}|#{session_created}|#{session_attached}|#{session_activity}"
+# tmux computes the seconds elapsed since creation and last activity itself (#{T:#{l:%s}} is the current time)
+TMUX_FORMAT = (
+    "#{session_name}|#{session_windows}|#{e|-:#{T:#{l:%s}},#{session_created}}"
+    "|#{session_attached}|#{e|-:#{T:#{l:%s}},#{session_activity}}"
+)
+MAX_SECONDS_AGO = 10**10
+CACHE_FILENAME = "sessions.json"
+CACHE_TTL_SECONDS = 5
+
+# Constant responses are pre-serialized so these paths skip JSON encoding entirely
+EMPTY_STATE_RESPONSE = (
+    b'{"items":[{"title":"No tmux sessions found",'
+    b'"subtitle":"Start typing to create a new session","valid":false}]}\n'
+)
+TMUX_NOT_FOUND_RESPONSE = (
+    b'{"items":[{"title":"tmux not found",'
+    b'"subtitle":"Install tmux: brew install tmux","valid":false}]}\n'
+)
+
+# Read the clock once per invocation to age the on-disk cache
+_NOW = int(time.time())
 
 
-@dataclass
 class Session:
     """Represents a tmux session with its metadata.
 
@@ -25,19 +49,43 @@ class Session:
         The unique identifier for the tmux session
     windows : int
         Number of windows in the session
-    created_timestamp : int
-        Unix timestamp when the session was created
+    created_seconds_ago : int
+        Seconds elapsed since the session was created
     is_attached : bool
         Whether a client is currently attached to this session
-    activity_timestamp : int
-        Unix timestamp of the last activity in the session
+    activity_seconds_ago : int
+        Seconds elapsed since the last activity in the session
+    name_lower : str
+        Lowercased session name, derived at construction for filtering
+    sort_key : tuple[bool, int, str]
+        Precomputed ordering key (attached first, then by recent activity)
     """
 
-    name: str
-    windows: int
-    created_timestamp: int
-    is_attached: bool
-    activity_timestamp: int
+    __slots__ = (
+        "name",
+        "windows",
+        "created_seconds_ago",
+        "is_attached",
+        "activity_seconds_ago",
+        "name_lower",
+        "sort_key",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        windows: int,
+        created_seconds_ago: int,
+        is_attached: bool,
+        activity_seconds_ago: int,
+    ) -> None:
+        self.name = name
+        self.windows = windows
+        self.created_seconds_ago = created_seconds_ago
+        self.is_attached = is_attached
+        self.activity_seconds_ago = activity_seconds_ago
+        self.name_lower = name.lower()
+        self.sort_key = (not is_attached, activity_seconds_ago, self.name_lower)
 
     @property
     def status_emoji(self) -> str:
@@ -59,7 +107,7 @@ class Session:
         str
             Relative time string (e.g., '2d ago', '3h ago')
         """
-        return format_time_ago(self.created_timestamp)
+        return format_time_ago(self.created_seconds_ago)
 
     @property
     def activity_ago(self) -> str:
@@ -70,7 +118,7 @@ class Session:
         str
             Relative time string (e.g., '2d ago', '3h ago')
         """
-        return format_time_ago(self.activity_timestamp)
+        return format_time_ago(self.activity_seconds_ago)
 
     @property
     def subtitle(self) -> str:
@@ -83,144 +131,266 @@ class Session:
         """
         return f"{self.status_emoji} • {self.windows} windows • created {self.created_ago} • active {self.activity_ago}"
 
-    def to_alfred_item(self) -> Dict[str, Any]:
+    def to_alfred_item(self) -> dict[str, object]:
         """Convert session to Alfred JSON item format.
 
         Returns
         -------
-        Dict[str, Any]
+        dict[str, object]
             Alfred-compatible JSON structure with title, subtitle,
             argument, and modifier keys for actions
         """
+        name = self.name
+        is_attached = self.is_attached
+
         return {
-            "title": self.name,
+            "title": name,
             "subtitle": self.subtitle,
-            "arg": self.name,
+            "arg": name,
             "mods": {
                 "cmd": {
-                    "subtitle": f"Delete session {self.name}",
-                    "arg": f"delete:{self.name}",
+                    "subtitle": f"Delete session {name}",
+                    "arg": f"delete:{name}",
                 },
                 "ctrl": {
                     "subtitle": (
-                        f"Detach from session {self.name}"
-                        if self.is_attached
-                        else f"Session {self.name} already detached"
+                        f"Detach from session {name}" if is_attached else f"Session {name} already detached"
                     ),
-                    "arg": f"detach:{self.name}",
-                    "valid": self.is_attached,
+                    "arg": f"detach:{name}",
+                    "valid": is_attached,
                 },
                 "shift": {
-                    "subtitle": f"Open linked session for {self.name} (independent navigation)",
-                    "arg": f"attach-linked:{self.name}",
+                    "subtitle": f"Open linked session for {name} (independent navigation)",
+                    "arg": f"attach-linked:{name}",
                 },
             },
         }
 
 
-def format_time_ago(timestamp: int) -> str:
-    """Convert Unix timestamp to human-readable relative time.
+def format_time_ago(seconds: int) -> str:
+    """Convert elapsed seconds to human-readable relative time.
 
     Parameters
     ----------
-    timestamp : int
-        Unix timestamp to convert
+    seconds : int
+        Number of seconds elapsed since the event
 
     Returns
     -------
     str
         Human-readable time string (e.g., '2d ago', '3h ago', 'just now')
-        Returns 'unknown' if timestamp is invalid
+        Returns 'unknown' if the elapsed time is implausibly large
     """
-    try:
-        delta = datetime.now() - datetime.fromtimestamp(timestamp)
+    if seconds > MAX_SECONDS_AGO:
+        return "unknown"
 
-        if delta.days > 0:
-            return f"{delta.days}d ago"
+    if seconds >= 86400:
+        return f"{seconds // 86400}d ago"
 
-        hours = delta.seconds // 3600
-        if hours > 0:
-            return f"{hours}h ago"
+    if seconds >= 3600:
+        return f"{seconds // 3600}h ago"
 
-        minutes = delta.seconds // 60
-        if minutes > 0:
-            return f"{minutes}m ago"
+    if seconds >= 60:
+        return f"{seconds // 60}m ago"
 
-        return "just now"
-    except (ValueError, OSError, OverflowError):
-        return "unknown"
+    return "just now"
 
 
-def parse_session_line(line: str) -> Optional[Session]:
+def parse_session_line(line: bytes) -> Session | None:
     """Parse a tmux list-sessions output line into a Session object.
 
     Parameters
     ----------
-    line : str
-        Pipe-delimited line from tmux list-sessions output
+    line : bytes
+        Raw pipe-delimited line from tmux list-sessions output
 
     Returns
     -------
-    Optional[Session]
+    Session | None
         Session object if parsing succeeds, None otherwise
     """
-    if not line:
-        return None
-
-    parts = line.split("|")
-    if len(parts) < 5:
+    # Chained partition avoids allocating a list per line; missing fields come back empty
+    name, _, rest = line.partition(b"|")
+    windows, _, rest = rest.partition(b"|")
+    created, _, rest = rest.partition(b"|")
+    attached, separator, activity = rest.partition(b"|")
+    if not separator:
         return None
 
+    # Only the name can be non-ASCII, so it is the only field decoded; int() accepts bytes directly
     try:
+        created_seconds_ago = int(created)
+
         return Session(
-            name=parts[0],
-            windows=int(parts[1]) if parts[1].isdigit() else 1,
-            created_timestamp=int(parts[2]) if parts[2].isdigit() else 0,
-            is_attached=parts[3] == "1",
-            activity_timestamp=int(parts[4]) if parts[4].isdigit() else (int(parts[2]) if parts[2].isdigit() else 0),
+            name=name.decode("utf-8"),
+            windows=int(windows),
+            created_seconds_ago=created_seconds_ago,
+            is_attached=attached == b"1",
+            activity_seconds_ago=int(activity) if activity.isdigit() else created_seconds_ago,
         )
-    except (ValueError, IndexError):
+    except ValueError:
         return None
 
 
-def get_tmux_sessions() -> List[Session]:
-    """Fetch all tmux sessions from the system.
+def get_tmux_socket_path() -> str:
+    """Resolve the socket path of the tmux server that `tmux` would talk to.
 
     Returns
     -------
-    List[Session]
-        List of all active tmux sessions
+    str
+        Socket path from $TMUX when running inside tmux, otherwise the
+        default socket under $TMUX_TMPDIR (or /tmp)
+    """
+    tmux_env = os.environ.get("TMUX")
+    if tmux_env:
+        return tmux_env.split(",")[0]
+
+    tmux_tmpdir = os.environ.get("TMUX_TMPDIR") or "/tmp"
+    return os.path.join(tmux_tmpdir, f"tmux-{os.getuid()}", "default")
+
+
+def get_cache_path() -> str:
+    """Resolve the on-disk location of the session list cache.
+
+    Returns
+    -------
+    str
+        Cache file inside Alfred's workflow cache directory, falling back
+        to ~/Library/Caches/alfred-tmux-sessions outside of Alfred
+    """
+    cache_dir = os.environ.get("alfred_workflow_cache") or os.path.expanduser(
+        "~/Library/Caches/alfred-tmux-sessions"
+    )
+    return os.path.join(cache_dir, CACHE_FILENAME)
+
+
+def load_cached_sessions() -> list[Session] | None:
+    """Load sessions from the on-disk cache if it is still fresh.
+
+    Returns
+    -------
+    list[Session] | None
+        Cached sessions, or None if the cache is missing, stale, or unreadable
+    """
+    import json
+
+    try:
+        with open(get_cache_path(), encoding="utf-8") as f:
+            cache = json.load(f)
+
+        cache_age = _NOW - cache["time"]
+        if not 0 <= cache_age <= CACHE_TTL_SECONDS:
+            return None
+
+        # Elapsed times were captured when the cache was written, so age them to now
+        return [
+            Session(name, windows, created + cache_age, is_attached, activity + cache_age)
+            for name, windows, created, is_attached, activity in cache["sessions"]
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_cached_sessions(sessions: list[Session]) -> None:
+    """Atomically write sessions to the on-disk cache, ignoring failures.
+
+    Parameters
+    ----------
+    sessions : list[Session]
+        Sessions freshly fetched from tmux
+    """
+    import json
+
+    cache_path = get_cache_path()
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    cache = {
+        "time": _NOW,
+        "sessions": [
+            [s.name, s.windows, s.created_seconds_ago, s.is_attached, s.activity_seconds_ago]
+            for s in sessions
+        ],
+    }
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def list_tmux_sessions() -> list[Session]:
+    """Query tmux for all of its sessions.
+
+    Returns
+    -------
+    list[Session]
+        List of all active tmux sessions, empty if no server is running
 
     Raises
     ------
     FileNotFoundError
         If tmux is not installed on the system
     """
+    # A missing socket means no server, so skip the fork/exec of tmux entirely. tmux leaves
+    # its socket behind when the server exits, so an existing one still has to be asked.
+    if not os.path.exists(get_tmux_socket_path()):
+        import shutil
+
+        if shutil.which("tmux") is None:
+            raise FileNotFoundError("tmux")
+        return []
+
+    # Imported here so cache hits and the no-server path never pay for it
+    import subprocess
+
     try:
         result = subprocess.run(
             ["tmux", "list-sessions", "-F", TMUX_FORMAT],
             capture_output=True,
-            text=True,
-            check=True,
             timeout=5,
         )
+    except subprocess.TimeoutExpired:
+        return []
 
-        if not result.stdout.strip():
-            return []
+    # tmux exits non-zero when no server is running
+    if result.returncode != 0:
+        return []
 
-        sessions = []
-        for line in result.stdout.strip().split("\n"):
-            session = parse_session_line(line)
-            if session:
-                sessions.append(session)
+    return list(filter(None, map(parse_session_line, result.stdout.splitlines())))
 
-        return sessions
-    except subprocess.CalledProcessError:
-        return []
-    except subprocess.TimeoutExpired:
-        return []
-    except FileNotFoundError:
-        raise
+
+def get_tmux_sessions(use_cache: bool = True) -> list[Session]:
+    """Fetch all tmux sessions, reusing a listing cached in the last few seconds.
+
+    Every fresh listing is written back to the cache, including an empty
+    one, so sessions from a server that has since exited are never served.
+
+    Parameters
+    ----------
+    use_cache : bool
+        Whether a recently cached listing may be returned instead of
+        querying tmux
+
+    Returns
+    -------
+    list[Session]
+        List of all active tmux sessions
+
+    Raises
+    ------
+    FileNotFoundError
+        If tmux is not installed on the system
+    """
+    if use_cache:
+        cached_sessions = load_cached_sessions()
+        if cached_sessions is not None:
+            return cached_sessions
+
+    sessions = list_tmux_sessions()
+    save_cached_sessions(sessions)
+    return sessions
 
 
 def is_valid_session_name(name: str) -> bool:
@@ -239,11 +409,11 @@ def is_valid_session_name(name: str) -> bool:
     return (
         bool(name)
         and len(name) <= MAX_SESSION_NAME_LENGTH
-        and not any(char in name for char in INVALID_SESSION_CHARS)
+        and INVALID_SESSION_CHARS_RE.search(name) is None
     )
 
 
-def create_session_prompt(query: str) -> Dict[str, Any]:
+def create_session_prompt(query: str) -> dict[str, object]:
     """Create an Alfred item for creating a new session.
 
     Parameters
@@ -253,7 +423,7 @@ def create_session_prompt(query: str) -> Dict[str, Any]:
 
     Returns
     -------
-    Dict[str, Any]
+    dict[str, object]
         Alfred item offering to create session or showing validation error
     """
     if is_valid_session_name(query):
@@ -278,42 +448,79 @@ def create_session_prompt(query: str) -> Dict[str, Any]:
     }
 
 
-def create_empty_state_prompt() -> Dict[str, Any]:
-    """Create an Alfred item for when no sessions exist.
+def get_max_results() -> int | None:
+    """Read the optional cap on listed sessions from the workflow configuration.
 
     Returns
     -------
-    Dict[str, Any]
-        Alfred item with instructions for creating first session
+    int | None
+        Positive limit from the max_results workflow variable, or None
+        to list every matching session
     """
-    return {
-        "title": "No tmux sessions found",
-        "subtitle": "Start typing to create a new session",
-        "valid": False,
-    }
+    try:
+        max_results = int(os.environ.get("max_results", ""))
+    except ValueError:
+        return None
 
+    return max_results if max_results > 0 else None
 
-def filter_and_sort_sessions(sessions: List[Session], query: str) -> List[Session]:
+
+def filter_and_sort_sessions(
+    sessions: list[Session], query: str, limit: int | None = None
+) -> list[Session]:
     """Filter sessions by query and sort by attachment status and activity.
 
     Parameters
     ----------
-    sessions : List[Session]
+    sessions : list[Session]
         All available tmux sessions
     query : str
         Search string to filter session names
+    limit : int | None
+        Maximum number of sessions to return, or None for all of them
 
     Returns
     -------
-    List[Session]
+    list[Session]
         Filtered and sorted sessions (attached first, then by recent activity)
     """
-    filtered = [s for s in sessions if not query or query.lower() in s.name.lower()]
+    query_lower = query.lower()
+    filtered = [s for s in sessions if query_lower in s.name_lower]
 
-    return sorted(
-        filtered,
-        key=lambda s: (not s.is_attached, -s.activity_timestamp, s.name.lower()),
-    )
+    # Selecting the top few is O(N log K) instead of sorting everything
+    if limit is not None and limit < len(filtered):
+        import heapq
+
+        return heapq.nsmallest(limit, filtered, key=operator.attrgetter("sort_key"))
+
+    filtered.sort(key=operator.attrgetter("sort_key"))
+
+    return filtered
+
+
+def format_alfred_response(items: list[dict[str, object]]) -> bytes:
+    """Serialize Alfred items into the script filter JSON response.
+
+    Uses orjson when it is installed and falls back to the standard
+    library json module otherwise.
+
+    Parameters
+    ----------
+    items : list[dict[str, object]]
+        Alfred items to include in the response
+
+    Returns
+    -------
+    bytes
+        UTF-8 encoded JSON document with a top-level "items" array,
+        terminated by a newline
+    """
+    if orjson is not None:
+        return orjson.dumps({"items": items}, option=orjson.OPT_APPEND_NEWLINE)
+
+    import json
+
+    return (json.dumps({"items": items}, ensure_ascii=False) + "\n").encode("utf-8")
 
 
 def main() -> None:
@@ -326,47 +533,35 @@ def main() -> None:
     query = sys.argv[1].strip() if len(sys.argv) > 1 else ""
 
     try:
-        sessions = get_tmux_sessions()
-        filtered_sessions = filter_and_sort_sessions(sessions, query)
+        # An empty query is a fresh open of Alfred and always lists from tmux; the keystrokes
+        # that follow within the same query reuse that listing instead of forking tmux again
+        sessions = get_tmux_sessions(use_cache=bool(query))
+        filtered_sessions = filter_and_sort_sessions(sessions, query, get_max_results())
 
-        items: List[Dict[str, Any]] = [s.to_alfred_item() for s in filtered_sessions]
+        items: list[dict[str, object]] = [s.to_alfred_item() for s in filtered_sessions]
 
-        if not items:
-            if query:
-                items = [create_session_prompt(query)]
-            else:
-                items = [create_empty_state_prompt()]
+        if items:
+            response = format_alfred_response(items)
+        elif query:
+            response = format_alfred_response([create_session_prompt(query)])
+        else:
+            response = EMPTY_STATE_RESPONSE
 
-        print(json.dumps({"items": items}, ensure_ascii=False))
+        # Write pre-encoded bytes straight to the buffer, bypassing the text layer
+        sys.stdout.buffer.write(response)
 
     except FileNotFoundError:
-        print(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "title": "tmux not found",
-                            "subtitle": "Install tmux: brew install tmux",
-                            "valid": False,
-                        }
-                    ]
-                },
-                ensure_ascii=False,
-            )
-        )
+        sys.stdout.buffer.write(TMUX_NOT_FOUND_RESPONSE)
     except Exception as e:
-        print(
-            json.dumps(
-                {
-                    "items": [
-                        {
-                            "title": "Unexpected error",
-                            "subtitle": str(e),
-                            "valid": False,
-                        }
-                    ]
-                },
-                ensure_ascii=False,
+        sys.stdout.buffer.write(
+            format_alfred_response(
+                [
+                    {
+                        "title": "Unexpected error",
+                        "subtitle": str(e),
+                        "valid": False,
+                    }
+                ]
             )
         )
 